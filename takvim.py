@@ -2,13 +2,16 @@ import sys
 import os
 import json
 import datetime
+import heapq
+import itertools
+import time
 
 # PyQt5 modülleri
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout,
     QTableWidget, QTableWidgetItem, QPushButton, QDialog, QFormLayout, QLineEdit,
     QTextEdit, QDateEdit, QDateTimeEdit, QLabel, QMessageBox, QPlainTextEdit,
-    QCalendarWidget, QDialogButtonBox, QCheckBox
+    QCalendarWidget, QDialogButtonBox, QCheckBox, QSpinBox
 )
 from PyQt5 import QtCore
 
@@ -32,6 +35,96 @@ def clean_json_response(response):
         response = "\n".join(lines)
     return response.strip()
 
+def _strip_trailing_comma(chars):
+    """Karakter listesinin sonundaki boşlukları ve tek bir virgülü yerinde siler."""
+    while chars and chars[-1].isspace():
+        chars.pop()
+    if chars and chars[-1] == ",":
+        chars.pop()
+
+def _is_safe_point(stack):
+    """
+    Yanıt bu noktada kesilebilir mi? Bir dizinin doğrudan elemanı ya da dizi içinde olmayan
+    bir nesne üyesi tamamlandıysa evet; dizi içindeki bir kaydın (görev/etkinlik) yarısında hayır.
+    """
+    return stack[-1] == "]" or "]" not in stack
+
+def extract_json_object(response):
+    """
+    Yanıt metninin herhangi bir yerindeki en dıştaki JSON nesnesini bulur ve sık görülen
+    hataları onarır: baştaki/sondaki açıklama metinleri ve markdown işaretleri, sondaki
+    virgüller, metin içindeki kaçışsız satır sonları ve yanlış kapatılmış parantezler.
+    Yanıt yarıda kesilmişse son tamamlanmış değere kadar olan kısım kurtarılır; böylece
+    eksiksiz gelen tüm etkinlik/görev kayıtları ve "yorum" gibi alanlar kullanılabilir.
+    (veri, kesik_mi) döndürür; JSON bulunamazsa veri None olur.
+    """
+    text = clean_json_response(response)
+    start = text.find("{")
+    while start != -1:
+        out = []            # Onarılmış karakterler
+        stack = []          # Beklenen kapanış karakterleri
+        last_safe = None    # Son tamamlanan değerden sonraki (konum, stack) durumu
+        in_string = escape = False
+        for ch in text[start:]:
+            if in_string:
+                if escape:
+                    escape = False
+                elif ch == "\\":
+                    escape = True
+                elif ch == '"':
+                    in_string = False
+                elif ch == "\n":
+                    ch = "\\n"
+                out.append(ch)
+            elif ch == '"':
+                in_string = True
+                out.append(ch)
+            elif ch in "{[":
+                stack.append("}" if ch == "{" else "]")
+                out.append(ch)
+            elif ch in "}]":
+                if ch not in stack:
+                    continue  # Eşi olmayan kapanış atlanır
+                # Kapatılmamış iç parantezler, gelen kapanışa kadar tamamlanır.
+                while True:
+                    _strip_trailing_comma(out)
+                    closer = stack.pop()
+                    out.append(closer)
+                    if closer == ch:
+                        break
+                if not stack:
+                    break
+                if _is_safe_point(stack):
+                    last_safe = (len(out), list(stack))
+            elif ch == ",":
+                # Virgülden önceki üye (metin, sayı veya kapanmış değer) tamamlanmıştır.
+                if _is_safe_point(stack):
+                    last_safe = (len(out), list(stack))
+                out.append(ch)
+            else:
+                out.append(ch)
+
+        if not stack:
+            try:
+                return json.loads("".join(out), strict=False), False
+            except ValueError:
+                # Açıklama metnindeki süslü parantez olabilir; sonraki adayı dene.
+                start = text.find("{", start + 1)
+                continue
+
+        # Yanıt kesik: son tamamlanan değerden sonrasını at, açık parantezleri kapat.
+        if last_safe is not None:
+            pos, open_stack = last_safe
+            salvaged = out[:pos]
+            _strip_trailing_comma(salvaged)
+            try:
+                return json.loads("".join(salvaged) + "".join(reversed(open_stack)), strict=False), True
+            except ValueError:
+                pass
+        # Kapanmayan "{" açıklama metnine ait olabilir; sonraki adayı dene.
+        start = text.find("{", start + 1)
+    return None, False
+
 # ---------------------------
 # KONFIGÜRASYON DOSYASI & VERİ DOSYALARI
 # ---------------------------
@@ -55,6 +148,19 @@ if not os.path.exists(CONFIG_FILE):
 with open(CONFIG_FILE, "r", encoding="utf-8") as f:
     config = json.load(f)
 
+# Hatırlatma varsayılanları (config.json içinden değiştirilebilir)
+EVENT_REMINDER_MINUTES = int(config.get("event_reminder_minutes", 15))  # Etkinlikten kaç dk önce
+TASK_REMINDER_MINUTES = int(config.get("task_reminder_minutes", 0))     # Görev saatinden kaç dk önce
+TASK_REMINDER_TIME = config.get("task_reminder_time", "09:00")         # Bitiş günündeki hatırlatma saati
+SNOOZE_MINUTES = int(config.get("snooze_minutes", 10))
+
+def reminder_minutes(item, default):
+    """Kaydın hatırlatma süresini int olarak döndürür; eksik veya geçersizse varsayılanı kullanır."""
+    try:
+        return int(item.get("reminder_minutes"))
+    except (TypeError, ValueError, OverflowError):
+        return default
+
 # ---------------------------
 # VERİ YÖNETİMİ: TASKS ve EVENTS
 # ---------------------------
@@ -84,6 +190,38 @@ def save_events(events):
     with open(EVENTS_FILE, "w", encoding="utf-8") as f:
         json.dump(events, f, indent=4, ensure_ascii=False)
 
+_last_id = 0
+
+def generate_id():
+    """
+    Milisaniye zaman damgasından benzersiz id üretir. Aynı milisaniye içinde birden fazla
+    kayıt oluşturulursa (ör. yapay zeka yanıtları) değer bir artırılarak çakışma önlenir.
+    """
+    global _last_id
+    _last_id = max(QtCore.QDateTime.currentMSecsSinceEpoch(), _last_id + 1)
+    return str(_last_id)
+
+def ensure_unique_ids(records, used=None):
+    """
+    Kayıt id'lerini metne çevirir; eksik veya daha önce kullanılmış id'lere yeni bir id atar.
+    Eski sürümlerde aynı milisaniyede oluşturulan ya da yapay zekanın verdiği ("1", "2" gibi)
+    id'ler çakışabildiğinden kullanılır. Herhangi bir kayıt değiştiyse True döndürür.
+    """
+    used = set() if used is None else used
+    changed = False
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        record_id = record.get("id")
+        if record_id is None or str(record_id) in used:
+            record["id"] = generate_id()
+            changed = True
+        elif not isinstance(record_id, str):
+            record["id"] = str(record_id)
+            changed = True
+        used.add(record["id"])
+    return changed
+
 # ---------------------------
 # GOOGLE GENERATIVE AI ENTEGRASYONU
 # ---------------------------
@@ -94,24 +232,56 @@ except ImportError:
 
 genai.configure(api_key=config["gemini_api_key"])
 
-def call_gemini_api(prompt):
+GENERATION_CONFIG = {
+    "temperature": 1,
+    "top_p": 0.95,
+    "top_k": 40,
+    "max_output_tokens": 8192,
+}
+
+# Çıktı sınırına takılan yanıtlar için en fazla kaç devam isteği gönderileceği
+MAX_CONTINUATIONS = int(config.get("max_continuations", 2))
+CONTINUATION_PROMPT = (
+    "Yanıtın çıktı sınırına ulaştığı için kesildi. Tam olarak kaldığın karakterden devam et. "
+    "Önceki kısmı tekrarlama, markdown biçimlendirme veya açıklama ekleme."
+)
+
+def response_was_truncated(response):
+    """Yanıtın max_output_tokens sınırı nedeniyle kesilip kesilmediğini döndürür."""
+    try:
+        reason = response.candidates[0].finish_reason
+    except (AttributeError, IndexError):
+        return False
+    return getattr(reason, "name", reason) in ("MAX_TOKENS", 2)
+
+def call_gemini_api(prompt, allow_continuation=False):
     """
     Verilen prompt'u Google Generative AI Gemini API'sine gönderir ve yanıtı döndürür.
+    allow_continuation True ise, çıktı sınırında kesilen yanıtlar için aynı oturumda
+    yalnızca eksik kalan devam kısmı istenir ve önceki metne eklenir.
     """
     try:
-        generation_config = {
-            "temperature": 1,
-            "top_p": 0.95,
-            "top_k": 40,
-            "max_output_tokens": 8192,
-        }
         model = genai.GenerativeModel(
             model_name=config.get("model", "gemini-2.0-flash"),
-            generation_config=generation_config,
+            generation_config=GENERATION_CONFIG,
         )
         chat_session = model.start_chat(history=[])
         response = chat_session.send_message(prompt)
-        return response.text
+        text = response.text
+        for _ in range(MAX_CONTINUATIONS if allow_continuation else 0):
+            if not response_was_truncated(response):
+                break
+            try:
+                response = chat_session.send_message(CONTINUATION_PROMPT)
+                continuation = response.text
+            except Exception:
+                # Devam alınamazsa eldeki kesik metin döndürülür; extract_json_object kurtarır.
+                break
+            # Model devam kısmını yine de kod bloğu içinde gönderebilir.
+            if continuation.lstrip().startswith("```"):
+                continuation = continuation.lstrip().split("\n", 1)[-1]
+            text += continuation
+        return text
     except Exception as e:
         return json.dumps({"error": str(e)})
 
@@ -121,14 +291,328 @@ def call_gemini_api(prompt):
 class GeminiWorker(QtCore.QThread):
     finished = QtCore.pyqtSignal(str)  # API yanıtı string olarak dönecek
 
-    def __init__(self, prompt, parent=None):
+    def __init__(self, prompt, parent=None, allow_continuation=False):
         super().__init__(parent)
         self.prompt = prompt
+        self.allow_continuation = allow_continuation
 
     def run(self):
-        result = call_gemini_api(self.prompt)
+        result = call_gemini_api(self.prompt, self.allow_continuation)
         self.finished.emit(result)
 
+# ---------------------------
+# SORU & CEVAP OTURUMU (çok turlu, bağlam önbelleği + değişiklik farkı)
+# ---------------------------
+QA_CACHE_TTL_MINUTES = int(config.get("qa_cache_ttl_minutes", 30))
+QA_SYSTEM_INSTRUCTION = (
+    "Kullanıcının program takvimi (etkinlikler) ve görev listesi verilerine dayanarak sorularını yanıtla. "
+    "Sonraki mesajlarda verideki değişiklikler ayrıca bildirilecek; yanıtlarında her zaman en güncel veriyi kullan."
+)
+
+def records_by_id(records):
+    """
+    Kayıtları id -> sıkıştırılmış JSON metni eşlemesine dönüştürür. id'si olmayan veya
+    tekrarlanan kayıtlar liste konumuyla ayrıştırılır; hiçbir kayıt düşürülmez.
+    """
+    state = {}
+    for pos, r in enumerate(records):
+        key = str(r.get("id")) if isinstance(r, dict) and r.get("id") is not None else ""
+        if not key or key in state:
+            key += "#" + str(pos)
+        state[key] = json.dumps(r, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return state
+
+def records_delta(label, old, new):
+    """İki id -> JSON eşlemesi arasındaki eklenen/güncellenen ve silinen kayıtları metin olarak döndürür."""
+    lines = []
+    changed = [new[k] for k in new if old.get(k) != new[k]]
+    removed = [old[k] for k in old if k not in new]
+    if changed:
+        lines.append("Eklenen/güncellenen " + label + ": [" + ",".join(changed) + "]")
+    if removed:
+        lines.append("Silinen " + label + ": [" + ",".join(removed) + "]")
+    return lines
+
+class QASession:
+    """
+    Soru & Cevap için kalıcı sohbet oturumu. Etkinlik ve görev verileri oturum başında bir kez
+    gönderilir; model destekliyorsa Gemini bağlam önbelleğine (cached content) yüklenir.
+    Sonraki mesajlara yalnızca soru ve son turdan bu yana değişen kayıtlar eklenir. Önbellek
+    kullanılamadığında API sohbet geçmişini (ilk veri mesajı dahil) her turda yeniden gönderir.
+    """
+    def __init__(self):
+        self.chat = None
+        self.cache = None
+        self.sent_events = {}  # Modele son bildirilen veri (id -> JSON)
+        self.sent_tasks = {}
+        self.turn = 0
+
+    def prepare(self, question, events, tasks):
+        """
+        Ana iş parçacığında çağrılır: verinin anlık durumunu ve açık bir oturum varsa son turdan
+        bu yana değişiklik farkını hazırlar. Veri durumu yalnızca istek başarılı olursa kaydedilir.
+        """
+        events_state = records_by_id(events)
+        tasks_state = records_by_id(tasks)
+        delta = []
+        if self.chat is not None:
+            delta = (records_delta("etkinlikler", self.sent_events, events_state)
+                     + records_delta("görevler", self.sent_tasks, tasks_state))
+        return {
+            "question": question,
+            "delta": ("Son sorudan bu yana veri değişiklikleri:\n" + "\n".join(delta)) if delta else "",
+            "events": events_state,
+            "tasks": tasks_state,
+        }
+
+    def start(self, snapshot):
+        """
+        Sohbeti başlatır. Anlık görüntü önbelleğe yüklenebildiyse boş, aksi halde ilk mesajın
+        başına eklenecek metni döndürür.
+        """
+        model_name = config.get("model", "gemini-2.0-flash")
+        try:
+            self.cache = genai.caching.CachedContent.create(
+                model=model_name,
+                system_instruction=QA_SYSTEM_INSTRUCTION,
+                contents=[{"role": "user", "parts": [snapshot]}],
+                ttl=datetime.timedelta(minutes=QA_CACHE_TTL_MINUTES),
+            )
+            model = genai.GenerativeModel.from_cached_content(
+                cached_content=self.cache, generation_config=GENERATION_CONFIG
+            )
+            prefix = ""
+        except Exception:
+            # Model önbelleği desteklemiyor ya da veri asgari önbellek boyutunun altında.
+            self.cache = None
+            model = genai.GenerativeModel(
+                model_name=model_name,
+                generation_config=GENERATION_CONFIG,
+                system_instruction=QA_SYSTEM_INSTRUCTION,
+            )
+            prefix = snapshot + "\n\n"
+        self.chat = model.start_chat(history=[])
+        return prefix
+
+    def ask(self, payload):
+        """
+        İş parçacığında çağrılır. Soruyu gönderir; yanıt metni, token kullanımı ve süreyi içeren
+        bir sözlük döndürür. Açık oturumda hata olursa (ör. önbellek süresi dolduysa) oturum
+        yeniden başlatılıp aynı soru bir kez daha denenir.
+        """
+        started = time.perf_counter()
+        restarted = False
+        while True:
+            try:
+                response = self.send(payload)
+                text = response.text
+                break
+            except Exception as e:
+                had_session = self.chat is not None and self.turn > 0
+                self.reset()
+                if not had_session or restarted:
+                    return {"error": str(e)}
+                restarted = True
+        self.sent_events = payload["events"]
+        self.sent_tasks = payload["tasks"]
+        self.turn += 1
+        usage = getattr(response, "usage_metadata", None)
+        return {
+            "text": text,
+            "turn": self.turn,
+            "prompt_tokens": getattr(usage, "prompt_token_count", 0) or 0,
+            "cached_tokens": getattr(usage, "cached_content_token_count", 0) or 0,
+            "output_tokens": getattr(usage, "candidates_token_count", 0) or 0,
+            "latency": time.perf_counter() - started,
+            "context_cached": self.cache is not None,
+            "restarted": restarted,
+        }
+
+    def send(self, payload):
+        """Oturum yoksa anlık görüntüyle başlatır, varsa yalnızca fark ve soruyu gönderir."""
+        question = "Soru: " + payload["question"]
+        if self.chat is None:
+            snapshot = (
+                "Program Takvimi:\n[" + ",".join(payload["events"].values()) + "]\n\n"
+                "Görev Listesi:\n[" + ",".join(payload["tasks"].values()) + "]"
+            )
+            # start() self.chat'i oluşturur; send_message ondan sonra çözülmeli.
+            prefix = self.start(snapshot)
+            return self.chat.send_message(prefix + question)
+        if self.cache is not None:
+            # Oturum kullanıldıkça önbellek süresi uzatılır; boşta kalınca kendiliğinden silinir.
+            try:
+                self.cache.update(ttl=datetime.timedelta(minutes=QA_CACHE_TTL_MINUTES))
+            except Exception:
+                pass
+        if payload["delta"]:
+            question = payload["delta"] + "\n\n" + question
+        return self.chat.send_message(question)
+
+    def reset(self):
+        """Oturumu kapatır; varsa sunucudaki bağlam önbelleğini siler."""
+        if self.cache is not None:
+            try:
+                self.cache.delete()
+            except Exception:
+                pass
+        self.chat = None
+        self.cache = None
+        self.sent_events = {}
+        self.sent_tasks = {}
+        self.turn = 0
+
+class QAWorker(QtCore.QThread):
+    finished = QtCore.pyqtSignal(object)  # QASession.ask sonucu (dict)
+
+    def __init__(self, session, payload, parent=None):
+        super().__init__(parent)
+        self.session = session
+        self.payload = payload
+
+    def run(self):
+        self.finished.emit(self.session.ask(self.payload))
+
+# ---------------------------
+# HATIRLATMA ZAMANLAYICISI (min-heap + tek QTimer)
+# ---------------------------
+class ReminderScheduler(QtCore.QObject):
+    """
+    Etkinlik ve görevlerin hatırlatma zamanlarını bir min-heap içinde tutar ve yalnızca
+    en yakın tetikleme zamanına kurulmuş tek bir QTimer ile bekler. Ekleme, düzenleme ve
+    silme işlemleri heap'i artımlı olarak günceller; listelerin tamamı taranmaz.
+    Geçersiz kalan heap kayıtları hemen silinmez, sırası geldiğinde atlanır.
+    """
+    reminder_due = QtCore.pyqtSignal(str, str, str, str)  # tür, id, başlık, zaman
+
+    MAX_TIMER_MS = 2 ** 31 - 1  # QTimer aralığı 32 bit tamsayı ile sınırlı
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # [tetikleme_zamanı, sıra, tür, id, başlık, zaman_metni, asıl_tetikleme_zamanı]
+        # Ertelenen kayıtlarda ilk alan erteleme zamanı, son alan asıl hatırlatma zamanıdır.
+        self.heap = []
+        self.active = {}     # (tür, id) -> geçerli heap kaydı
+        self.fired = set()   # (tür, id, asıl_tetikleme_zamanı): aynı hatırlatma iki kez gösterilmesin
+        self.last_fired = {} # (tür, id) -> son gösterilen hatırlatmanın asıl tetikleme zamanı
+        self.counter = itertools.count()
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.on_timeout)
+
+    def load(self, events, tasks):
+        """Başlangıçta tüm kayıtlardan heap'i tek seferde (O(n)) kurar."""
+        self.heap = []
+        self.active = {}
+        for ev in events:
+            entry = self.make_entry("event", ev)
+            if entry:
+                self.heap.append(entry)
+                self.active[("event", entry[3])] = entry
+        for task in tasks:
+            entry = self.make_entry("task", task)
+            if entry:
+                self.heap.append(entry)
+                self.active[("task", entry[3])] = entry
+        heapq.heapify(self.heap)
+        self.rearm()
+
+    def reminder_time(self, kind, item):
+        """Kaydın (tetikleme_zamanı, zaman_metni) bilgisini döndürür; hatırlatma gerekmiyorsa None."""
+        lead = reminder_minutes(item, EVENT_REMINDER_MINUTES if kind == "event" else TASK_REMINDER_MINUTES)
+        if lead < 0:  # Hatırlatma kapalı
+            return None
+        try:
+            if kind == "event":
+                when_str = item.get("datetime", "")
+                when = datetime.datetime.strptime(when_str, "%Y-%m-%d %H:%M")
+            else:
+                if item.get("completed", False):
+                    return None
+                when_str = item.get("due_date", "")
+                when = datetime.datetime.strptime(when_str + " " + TASK_REMINDER_TIME, "%Y-%m-%d %H:%M")
+        except (ValueError, TypeError):
+            return None
+        if when < datetime.datetime.now():
+            return None
+        return (when - datetime.timedelta(minutes=lead)).timestamp(), str(when_str)
+
+    def make_entry(self, kind, item):
+        """Kaydın heap kaydını oluşturur; hatırlatma gerekmiyorsa veya gösterildiyse None döner."""
+        reminder = self.reminder_time(kind, item)
+        if reminder is None:
+            return None
+        trigger, when_str = reminder
+        # Sinyal yalnızca str kabul ettiğinden yapay zekadan gelen değerler metne çevrilir.
+        item_id = str(item.get("id"))
+        if (kind, item_id, trigger) in self.fired:
+            return None
+        return [trigger, next(self.counter), kind, item_id, str(item.get("title") or ""), when_str, trigger]
+
+    def schedule(self, kind, item):
+        """Eklenen, düzenlenen veya durumu değişen bir kaydın hatırlatmasını günceller."""
+        key = (kind, str(item.get("id")))
+        old = self.active.pop(key, None)
+        reminder = self.reminder_time(kind, item)
+        if old is not None and reminder is not None and old[6] == reminder[0]:
+            # Hatırlatma zamanı değişmediyse (ertelenmiş olsa bile) mevcut kayıt korunur.
+            old[4] = str(item.get("title") or "")
+            old[5] = reminder[1]
+            self.active[key] = old
+            self.rearm()
+            return
+        entry = self.make_entry(kind, item)
+        if entry:
+            self.push(key, entry)
+        else:
+            self.rearm()
+
+    def remove(self, kind, item_id):
+        if self.active.pop((kind, str(item_id)), None) is not None:
+            self.rearm()
+
+    def snooze(self, kind, item_id, title, when_str, minutes=None):
+        """Gösterilen hatırlatmayı belirtilen dakika kadar erteler."""
+        minutes = SNOOZE_MINUTES if minutes is None else minutes
+        trigger = time.time() + minutes * 60
+        base = self.last_fired.get((kind, item_id))
+        self.push((kind, item_id), [trigger, next(self.counter), kind, item_id, title, when_str, base])
+
+    def push(self, key, entry):
+        self.active[key] = entry
+        heapq.heappush(self.heap, entry)
+        # Çok sayıda düzenleme sonrası geçersiz kayıtlar birikirse heap'i yeniden kur.
+        if len(self.heap) > 2 * len(self.active) + 64:
+            self.heap = list(self.active.values())
+            heapq.heapify(self.heap)
+        self.rearm()
+
+    def is_current(self, entry):
+        return self.active.get((entry[2], entry[3])) is entry
+
+    def rearm(self):
+        """Zamanlayıcıyı heap'teki en yakın geçerli tetikleme zamanına kurar."""
+        while self.heap and not self.is_current(self.heap[0]):
+            heapq.heappop(self.heap)
+        if not self.heap:
+            self.timer.stop()
+            return
+        delay_ms = int((self.heap[0][0] - time.time()) * 1000)
+        self.timer.start(max(0, min(delay_ms, self.MAX_TIMER_MS)))
+
+    def on_timeout(self):
+        now = time.time()
+        while self.heap and self.heap[0][0] <= now:
+            entry = heapq.heappop(self.heap)
+            if not self.is_current(entry):
+                continue
+            _, _, kind, item_id, title, when_str, base = entry
+            del self.active[(kind, item_id)]
+            self.fired.add((kind, item_id, base))
+            self.last_fired[(kind, item_id)] = base
+            self.reminder_due.emit(kind, item_id, title, when_str)
+        self.rearm()
+
 # ---------------------------
 # ÖZEL DİYALOGLAR: Görev ve Etkinlik Formları
 # ---------------------------
@@ -160,9 +644,16 @@ class TaskDialog(QDialog):
         else:
             self.due_date_edit.setDate(QtCore.QDate.currentDate())
 
+        # Hatırlatma: bitiş günündeki hatırlatma saatinden kaç dakika önce (-1: kapalı)
+        self.reminder_spin = QSpinBox(self)
+        self.reminder_spin.setRange(-1, 7 * 24 * 60)
+        self.reminder_spin.setSpecialValueText("Kapalı")
+        self.reminder_spin.setValue(reminder_minutes(task or {}, TASK_REMINDER_MINUTES))
+
         layout.addRow("Başlık:", self.title_edit)
         layout.addRow("Açıklama:", self.desc_edit)
         layout.addRow("Bitiş Tarihi:", self.due_date_edit)
+        layout.addRow("Hatırlatma (" + TASK_REMINDER_TIME + " itibarıyla dk önce):", self.reminder_spin)
 
         btn_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         btn_box.accepted.connect(self.accept)
@@ -173,7 +664,8 @@ class TaskDialog(QDialog):
         return {
             "title": self.title_edit.text(),
             "description": self.desc_edit.toPlainText(),
-            "due_date": self.due_date_edit.date().toString("yyyy-MM-dd")
+            "due_date": self.due_date_edit.date().toString("yyyy-MM-dd"),
+            "reminder_minutes": self.reminder_spin.value()
         }
 
 class EventDialog(QDialog):
@@ -204,9 +696,16 @@ class EventDialog(QDialog):
         else:
             self.datetime_edit.setDateTime(QtCore.QDateTime.currentDateTime())
 
+        # Hatırlatma: etkinlikten kaç dakika önce (-1: kapalı)
+        self.reminder_spin = QSpinBox(self)
+        self.reminder_spin.setRange(-1, 7 * 24 * 60)
+        self.reminder_spin.setSpecialValueText("Kapalı")
+        self.reminder_spin.setValue(reminder_minutes(event or {}, EVENT_REMINDER_MINUTES))
+
         layout.addRow("Başlık:", self.title_edit)
         layout.addRow("Açıklama:", self.desc_edit)
         layout.addRow("Tarih & Saat:", self.datetime_edit)
+        layout.addRow("Hatırlatma (dk önce):", self.reminder_spin)
 
         btn_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         btn_box.accepted.connect(self.accept)
@@ -217,7 +716,8 @@ class EventDialog(QDialog):
         return {
             "title": self.title_edit.text(),
             "description": self.desc_edit.toPlainText(),
-            "datetime": self.datetime_edit.dateTime().toString("yyyy-MM-dd HH:mm")
+            "datetime": self.datetime_edit.dateTime().toString("yyyy-MM-dd HH:mm"),
+            "reminder_minutes": self.reminder_spin.value()
         }
 
 # ---------------------------
@@ -230,10 +730,23 @@ class MainWindow(QMainWindow):
         self.resize(1000, 700)
         self.tasks = load_tasks()
         self.events = load_events()
+        # Hatırlatmalar ve Soru & Cevap kayıtları id ile izlediğinden çakışan id'ler bir kez düzeltilir.
+        if ensure_unique_ids(self.tasks):
+            save_tasks(self.tasks)
+        if ensure_unique_ids(self.events):
+            save_events(self.events)
         # Yapay zekadan alınan görev listesi yanıtını saklamak için:
         self.last_task_list_data = None
         self.last_program_data = None  # Program takvimi yanıtı için
+        # Yanıt kesik geldiyse yalnızca kurtarılan kısım kullanıldığını belirtmek için:
+        self.last_task_list_truncated = False
+        self.last_program_truncated = False
+        self.qa_session = QASession()  # Soru & Cevap sohbeti sekme boyunca korunur
         self.initUI()
+        # Hatırlatmalar: sinyal kuyruklu bağlanır, böylece açılan diyaloglar zamanlayıcıyı bloklamaz.
+        self.reminders = ReminderScheduler(self)
+        self.reminders.reminder_due.connect(self.show_reminder, QtCore.Qt.QueuedConnection)
+        self.reminders.load(self.events, self.tasks)
 
     def initUI(self):
         self.tab_widget = QTabWidget(self)
@@ -296,14 +809,16 @@ class MainWindow(QMainWindow):
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.get_data()
             new_task = {
-                "id": str(QtCore.QDateTime.currentMSecsSinceEpoch()),
+                "id": generate_id(),
                 "title": data["title"],
                 "description": data["description"],
                 "due_date": data["due_date"],
-                "completed": False
+                "completed": False,
+                "reminder_minutes": data["reminder_minutes"]
             }
             self.tasks.append(new_task)
             save_tasks(self.tasks)
+            self.reminders.schedule("task", new_task)
             self.refresh_tasks_table()
 
     def edit_task(self):
@@ -325,7 +840,9 @@ class MainWindow(QMainWindow):
                 task["saved_due_date"] = data["due_date"]
             else:
                 task["due_date"] = data["due_date"]
+            task["reminder_minutes"] = data["reminder_minutes"]
             save_tasks(self.tasks)
+            self.reminders.schedule("task", task)
             self.refresh_tasks_table()
 
     def delete_task(self):
@@ -336,6 +853,7 @@ class MainWindow(QMainWindow):
         task_id = selected_items[0].data(QtCore.Qt.UserRole)
         self.tasks = [t for t in self.tasks if t.get("id") != task_id]
         save_tasks(self.tasks)
+        self.reminders.remove("task", task_id)
         self.refresh_tasks_table()
 
     def toggle_task_completion(self):
@@ -359,6 +877,7 @@ class MainWindow(QMainWindow):
                 task["due_date"] = task["saved_due_date"]
                 del task["saved_due_date"]
         save_tasks(self.tasks)
+        self.reminders.schedule("task", task)
         self.refresh_tasks_table()
 
     # ----- Takvim Sekmesi -----
@@ -411,13 +930,15 @@ class MainWindow(QMainWindow):
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.get_data()
             new_event = {
-                "id": str(QtCore.QDateTime.currentMSecsSinceEpoch()),
+                "id": generate_id(),
                 "title": data["title"],
                 "description": data["description"],
-                "datetime": data["datetime"]
+                "datetime": data["datetime"],
+                "reminder_minutes": data["reminder_minutes"]
             }
             self.events.append(new_event)
             save_events(self.events)
+            self.reminders.schedule("event", new_event)
             self.refresh_events_table()
 
     def edit_event(self):
@@ -436,7 +957,9 @@ class MainWindow(QMainWindow):
             event["title"] = data["title"]
             event["description"] = data["description"]
             event["datetime"] = data["datetime"]
+            event["reminder_minutes"] = data["reminder_minutes"]
             save_events(self.events)
+            self.reminders.schedule("event", event)
             self.refresh_events_table()
 
     def delete_event(self):
@@ -447,8 +970,25 @@ class MainWindow(QMainWindow):
         event_id = selected_items[0].data(QtCore.Qt.UserRole)
         self.events = [ev for ev in self.events if ev.get("id") != event_id]
         save_events(self.events)
+        self.reminders.remove("event", event_id)
         self.refresh_events_table()
 
+    # ----- Hatırlatmalar -----
+    def show_reminder(self, kind, item_id, title, when_str):
+        kind_text = "Etkinlik" if kind == "event" else "Görev"
+        box = QMessageBox(self)
+        box.setIcon(QMessageBox.Information)
+        box.setWindowTitle("Hatırlatma")
+        box.setText(kind_text + ": " + title + "\nZaman: " + when_str)
+        snooze_btn = box.addButton(str(SNOOZE_MINUTES) + " dk Ertele", QMessageBox.ActionRole)
+        box.addButton(QMessageBox.Ok)
+        box.exec_()
+        if box.clickedButton() is snooze_btn:
+            # Diyalog açıkken kayıt silinmiş olabilir.
+            items = self.events if kind == "event" else self.tasks
+            if any(it.get("id") == item_id for it in items):
+                self.reminders.snooze(kind, item_id, title, when_str)
+
     # ----- Yapay Zeka / Gemini Sekmesi (3 alt bölüm) -----
     def init_gemini_tab(self):
         layout = QVBoxLayout(self.gemini_tab)
@@ -539,15 +1079,22 @@ class MainWindow(QMainWindow):
         layout = QVBoxLayout(widget)
         instructions = QLabel(
             "Lütfen aşağıdaki mevcut program takvimi ve görev listesi verilerine dayanarak, sorduğunuz soruya cevap veriniz.\n"
-            "Bu bölümde yalnızca cevap verilecektir."
+            "Bu bölümde yalnızca cevap verilecektir. Sorular aynı oturumda devam eder; veriler oturum başında bir kez,\n"
+            "sonraki sorulara yalnızca değişiklikler eklenir. Bağlam önbelleği kullanılamadığında önceki konuşma\n"
+            "(ilk veri mesajı dahil) her turda yeniden gönderilir; uzun sohbetlerde \"Yeni Oturum\" ile başlayabilirsiniz."
         )
         layout.addWidget(instructions)
         self.qa_input = QPlainTextEdit(widget)
         self.qa_input.setPlaceholderText("Sormak istediğiniz soruyu buraya yazınız...")
         layout.addWidget(self.qa_input)
+        btn_layout = QHBoxLayout()
         self.qa_send_btn = QPushButton("Gönder", widget)
-        layout.addWidget(self.qa_send_btn)
+        self.qa_reset_btn = QPushButton("Yeni Oturum", widget)
+        btn_layout.addWidget(self.qa_send_btn)
+        btn_layout.addWidget(self.qa_reset_btn)
+        layout.addLayout(btn_layout)
         self.qa_send_btn.clicked.connect(self.send_qa_message)
+        self.qa_reset_btn.clicked.connect(self.reset_qa_session)
         self.qa_output = QPlainTextEdit(widget)
         self.qa_output.setReadOnly(True)
         layout.addWidget(self.qa_output)
@@ -579,31 +1126,33 @@ class MainWindow(QMainWindow):
         )
         prompt = base_prompt + "\nKullanıcının eklemek istediği detay: " + user_message
         self.program_output.setPlainText("İşleniyor...")
-        self.program_worker = GeminiWorker(prompt)
+        self.program_worker = GeminiWorker(prompt, allow_continuation=True)
         self.program_worker.finished.connect(self.handle_program_response)
         self.program_worker.start()
 
     def handle_program_response(self, response):
-        response = clean_json_response(response)
-        try:
-            data = json.loads(response)
-        except Exception:
-            data = None
-        if data and "program" in data:
+        data, truncated = extract_json_object(response)
+        if isinstance(data, dict) and isinstance(data.get("program"), dict):
             program_data = data["program"]
             # "yorum" dışındaki verilerden etkinlikler ekleniyor.
             for day in program_data.get("günler", []):
+                if not isinstance(day, dict):
+                    continue
                 tarih = day.get("tarih", "")
                 for et in day.get("etkinlikler", []):
+                    if not isinstance(et, dict):
+                        continue
                     new_event = {
-                        "id": str(QtCore.QDateTime.currentMSecsSinceEpoch()),
+                        "id": generate_id(),
                         "title": et.get("başlık", "Yeni Etkinlik"),
                         "description": et.get("açıklama", ""),
                         "datetime": tarih + " " + et.get("saat", "00:00")
                     }
                     self.events.append(new_event)
+                    self.reminders.schedule("event", new_event)
             save_events(self.events)
             self.last_program_data = data  # Son yanıtı sakla
+            self.last_program_truncated = truncated
             self.update_program_output()    # Checkbox durumuna göre çıktı güncelle
         else:
             self.program_output.setPlainText("Alınan yanıt geçerli JSON formatında değil:\n" + response)
@@ -618,6 +1167,8 @@ class MainWindow(QMainWindow):
             output_text = comment if comment else "Yorum bulunamadı."
         else:
             output_text = "Program Oluşturuldu.\nYorum: " + comment + "\n\nJSON:\n" + json.dumps(self.last_program_data, indent=2, ensure_ascii=False)
+        if self.last_program_truncated:
+            output_text = "Not: Yanıt kesik geldi, yalnızca eksiksiz etkinlikler eklendi.\n\n" + output_text
         self.program_output.setPlainText(output_text)
 
     def send_list_message(self):
@@ -639,28 +1190,28 @@ class MainWindow(QMainWindow):
         )
         prompt = base_prompt + "\nKullanıcının eklemek istediği detay: " + user_message
         self.list_output.setPlainText("İşleniyor...")
-        self.list_worker = GeminiWorker(prompt)
+        self.list_worker = GeminiWorker(prompt, allow_continuation=True)
         self.list_worker.finished.connect(self.handle_list_response)
         self.list_worker.start()
 
     def handle_list_response(self, response):
-        response = clean_json_response(response)
-        try:
-            data = json.loads(response)
-        except Exception:
-            data = None
+        data, truncated = extract_json_object(response)
         # Beklenen yanıt, "gorev_listesi" ve "yorum" bilgilerini içeren bir dict olmalıdır.
-        if data and isinstance(data, dict) and "gorev_listesi" in data:
+        if data and isinstance(data, dict) and isinstance(data.get("gorev_listesi"), list):
             new_tasks = data["gorev_listesi"]
+            # Modelin verdiği id'ler mevcut görevlerle veya birbiriyle çakışabilir.
+            ensure_unique_ids(new_tasks, {t.get("id") for t in self.tasks})
             # Mevcut görevler silinmeden, yeni görevler ekleniyor.
             for item in new_tasks:
-                if "id" not in item:
-                    item["id"] = str(QtCore.QDateTime.currentMSecsSinceEpoch())
+                if not isinstance(item, dict):
+                    continue
                 if "completed" not in item:
                     item["completed"] = False
                 self.tasks.append(item)
+                self.reminders.schedule("task", item)
             save_tasks(self.tasks)
             self.last_task_list_data = data  # Son yanıtı sakla
+            self.last_task_list_truncated = truncated
             self.update_list_output()         # Checkbox durumuna göre çıktı güncelle
         else:
             self.list_output.setPlainText("Alınan yanıt geçerli JSON formatında değil:\n" + response)
@@ -675,6 +1226,8 @@ class MainWindow(QMainWindow):
             output_text = comment if comment else "Yorum bulunamadı."
         else:
             output_text = "Görev Listesi Oluşturuldu.\nYorum: " + comment + "\n\nJSON:\n" + json.dumps(self.last_task_list_data, indent=2, ensure_ascii=False)
+        if self.last_task_list_truncated:
+            output_text = "Not: Yanıt kesik geldi, yalnızca eksiksiz görevler eklendi.\n\n" + output_text
         self.list_output.setPlainText(output_text)
 
     def send_qa_message(self):
@@ -682,23 +1235,44 @@ class MainWindow(QMainWindow):
         if not user_message:
             QMessageBox.warning(self, "Uyarı", "Lütfen bir soru giriniz.")
             return
-        # Mevcut program (etkinlikler) ve görev listesi (tasks) verileri modele ekleniyor.
-        current_events = json.dumps(self.events, indent=2, ensure_ascii=False)
-        current_tasks = json.dumps(self.tasks, indent=2, ensure_ascii=False)
-        base_prompt = (
-            "Aşağıdaki mevcut program takvimi ve görev listesi verilerine dayanarak, sorunuza cevap verin:\n\n"
-            "Program Takvimi:\n" + current_events + "\n\nGörev Listesi:\n" + current_tasks + "\n\nSorunuz: "
-        )
-        prompt = base_prompt + user_message
-        self.qa_output.setPlainText("İşleniyor...")
-        self.qa_worker = GeminiWorker(prompt)
+        # İlk turda tüm veriler, sonraki turlarda yalnızca değişen kayıtlar gönderilir.
+        payload = self.qa_session.prepare(user_message, self.events, self.tasks)
+        self.qa_output.appendPlainText("Soru: " + user_message)
+        # Aynı sohbete eşzamanlı mesaj gönderilmemesi için yanıt gelene kadar butonlar kapalı.
+        self.qa_send_btn.setText("İşleniyor...")
+        self.qa_send_btn.setEnabled(False)
+        self.qa_reset_btn.setEnabled(False)
+        self.qa_worker = QAWorker(self.qa_session, payload)
         self.qa_worker.finished.connect(self.handle_qa_response)
         self.qa_worker.start()
 
-    def handle_qa_response(self, response):
-        self.qa_output.setPlainText(response)
+    def handle_qa_response(self, result):
+        self.qa_send_btn.setText("Gönder")
+        self.qa_send_btn.setEnabled(True)
+        self.qa_reset_btn.setEnabled(True)
+        if "error" in result:
+            self.qa_output.appendPlainText("Hata: " + result["error"] + "\nOturum sıfırlandı.\n")
+            return
+        stats = (
+            ("[Oturum hata sonrası yenilendi, veriler yeniden gönderildi] " if result["restarted"] else "")
+            + "[Tur " + str(result["turn"]) + " | Prompt: " + str(result["prompt_tokens"]) + " token"
+            + " (önbellekten: " + str(result["cached_tokens"]) + ")"
+            + " | Yanıt: " + str(result["output_tokens"]) + " token"
+            + " | Süre: " + "{:.2f}".format(result["latency"]) + " sn"
+            + " | Bağlam önbelleği: " + ("açık" if result["context_cached"] else "kapalı") + "]"
+        )
+        self.qa_output.appendPlainText("Cevap: " + result["text"].strip() + "\n" + stats + "\n")
         self.qa_input.clear()
 
+    def reset_qa_session(self):
+        self.qa_session.reset()
+        self.qa_output.clear()
+
+    def closeEvent(self, event):
+        # Sunucudaki bağlam önbelleği TTL dolmadan silinsin.
+        self.qa_session.reset()
+        super().closeEvent(event)
+
 # ---------------------------
 # UYGULAMAYI BAŞLAT
 # ---------------------------